@@ -0,0 +1,58 @@
+"""
+JSON serialization for tool responses, using orjson when it is installed
+"""
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to stdlib json
+    orjson = None
+
+# Responses are consumed by LLMs/MCP clients, so they are compact by default.
+# Set TODO_MCP_PRETTY_JSON=1 to get indented output when debugging.
+PRETTY_JSON = os.environ.get("TODO_MCP_PRETTY_JSON", "") not in ("", "0")
+
+# Reused by the stdlib fallback; json.dumps() with options builds a new encoder per call
+if PRETTY_JSON:
+    _json_encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+else:
+    _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_orjson_option = orjson.OPT_INDENT_2 if orjson is not None and PRETTY_JSON else 0
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to JSON text"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_orjson_option).decode()
+    return _json_encoder.encode(obj)
+
+def _dumps_task(task):
+    """Serialize a parsed task, memoizing the result on the task.
+
+    Parsed tasks are cached by the parser until the todo file changes and
+    are never modified after loading, so their encoding can be reused.
+    With orjson the encoding is kept as UTF-8 bytes, so a response is
+    joined as bytes and decoded once instead of once per task.
+    """
+    encoded = task.encoded
+    if encoded is None:
+        if orjson is not None:
+            encoded = task.encoded = orjson.dumps(task)
+        else:
+            encoded = task.encoded = _json_encoder.encode(task)
+    return encoded
+
+def dumps_tasks_response(tasks: list, metadata: dict) -> str:
+    """Serialize a {"tasks": [...], "metadata": {...}} response from fragments.
+
+    Each task is encoded on its own (and only once per parse) and the pieces
+    are joined, so the full response dict never has to be built just to be
+    serialized.
+    """
+    if PRETTY_JSON:
+        return dumps({"tasks": tasks, "metadata": metadata})
+    if orjson is not None:
+        body = b'{"tasks":[' + b','.join(map(_dumps_task, tasks)) + b'],"metadata":' + orjson.dumps(metadata) + b'}'
+        return body.decode()
+    return '{"tasks":[' + ','.join(map(_dumps_task, tasks)) + '],"metadata":' + dumps(metadata) + '}'
@@ -3,219 +3,173 @@ MCP Server for Todo.txt management
 """
 import asyncio
 import json
+import os
 import sys
-from typing import Any, Sequence
-from mcp.server.models import InitializationOptions
-from mcp.server import NotificationOptions, Server
-from mcp.types import (
-    Resource,
-    Tool,
-    TextContent,
-    ImageContent,
-    EmbeddedResource,
-    LoggingLevel,
-    CallToolRequest,
-    ListToolsRequest
-)
-from todo_manager import TodoManager
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Sequence
+from mcp.server import Server
+from mcp.types import Tool, TextContent
+from serialization import dumps
+from todo_manager import TodoManager, today_str
+from tools import TOOLS
 
 # Global todo manager - will be initialized with actual file path
 todo_manager: TodoManager = None
 
 def init_todo_manager(todo_file_path: str):
     """Initialize the todo manager with file path"""
-    global todo_manager
+    global todo_manager, _warmup
+    _warmup = None
     todo_manager = TodoManager(todo_file_path)
+    _bound_handlers.clear()
+    _bound_handlers.update(
+        (name, partial(handler, todo_manager)) for name, handler in _TOOL_HANDLERS.items()
+    )
+    _response_cache.clear()
+
+# Serialized tool responses, keyed on tool call + todo file state (LRU)
+RESPONSE_CACHE_SIZE = 64
+_response_cache: OrderedDict = OrderedDict()
+
+def _response_cache_key(name: str, arguments: dict) -> tuple:
+    """Build cache key for a tool call against the current todo file"""
+    try:
+        stat = os.stat(todo_manager.parser.todo_file)
+        file_key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+    # Results depend on today's date (overdue/due today), so include it
+    today = today_str()
+    return (name, json.dumps(arguments, sort_keys=True), file_key, today)
+
+# Background parse of the todo file started by main(), awaited by the first tool call
+_warmup: asyncio.Task | None = None
+
+# Tool responses are always text content
+_text = partial(TextContent, type="text")
+_NOT_INITIALIZED = [_text(text="Error: Todo manager not initialized")]
 
 # Create server instance
 server = Server("todo-assistant")
 
+# Required argument names per tool, taken from the tool input schemas
+_REQUIRED_ARGUMENTS = {tool.name: tuple(tool.inputSchema.get("required", ())) for tool in TOOLS}
+
 @server.list_tools()
 async def handle_list_tools() -> list[Tool]:
     """List available tools"""
-    return [
-        Tool(
-            name="get_task_overview",
-            description="Get comprehensive overview of all tasks including counts, priorities, and project status",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="suggest_next_task", 
-            description="Suggest the next task to work on based on priorities, due dates, and constraints",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "time_available_minutes": {
-                        "type": "integer",
-                        "description": "How many minutes are available for work"
-                    },
-                    "context_filter": {
-                        "type": "string", 
-                        "description": "Filter by context (e.g., 'offline', 'low')"
-                    },
-                    "energy_level": {
-                        "type": "string",
-                        "description": "Current energy level (high, medium, low)"
-                    }
-                },
-                "required": []
-            }
-        ),
-        Tool(
-            name="show_project_tasks",
-            description="Show all tasks for a specific project",
-            inputSchema={
-                "type": "object", 
-                "properties": {
-                    "project_name": {
-                        "type": "string",
-                        "description": "Name of the project (without + prefix)"
-                    }
-                },
-                "required": ["project_name"]
-            }
-        ),
-        Tool(
-            name="show_waiting_tasks",
-            description="Show all tasks that are waiting/blocked, organized by project",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }  
-        ),
-        Tool(
-            name="show_inbox_tasks",
-            description="Show all inbox tasks that need to be processed",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="show_context_tasks",
-            description="Show tasks filtered by specific context",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "context": {
-                        "type": "string",
-                        "description": "Context to filter by (e.g., 'offline', 'low', 'waiting')"
-                    }
-                },
-                "required": ["context"]
-            }
-        ),
-        Tool(
-            name="query_tasks",
-            description="Generic query interface for searching tasks by project, context, or task name with flexible filtering",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query_text": {
-                        "type": "string",
-                        "description": "Search text to find in task descriptions (partial match, case-insensitive)"
-                    },
-                    "projects": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Filter by specific projects (e.g., ['work', 'personal']). If empty, include all projects."
-                    },
-                    "contexts": {
-                        "type": "array", 
-                        "items": {"type": "string"},
-                        "description": "Filter by specific contexts (e.g., ['focus', 'offline']). If empty, include all contexts."
-                    },
-                    "exclude_completed": {
-                        "type": "boolean",
-                        "description": "Whether to exclude completed tasks (default: true)",
-                        "default": True
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of results to return (default: 1000)",
-                        "default": 1000
-                    }
-                },
-                "required": []
-            }
+    return TOOLS
+
+@dataclass(frozen=True, slots=True)
+class QueryArgs:
+    """Normalized query_tasks arguments, with defaults matching the tool schema"""
+    query_text: str = ""
+    projects: tuple = ()
+    contexts: tuple = ()
+    exclude_completed: bool = True
+    max_results: int = 1000
+
+    @classmethod
+    def from_arguments(cls, arguments: dict) -> "QueryArgs":
+        """Build from raw tool arguments, treating null values as defaults"""
+        exclude_completed = arguments.get("exclude_completed")
+        max_results = arguments.get("max_results")
+        return cls(
+            query_text=arguments.get("query_text") or "",
+            projects=tuple(arguments.get("projects") or ()),
+            contexts=tuple(arguments.get("contexts") or ()),
+            exclude_completed=True if exclude_completed is None else exclude_completed,
+            max_results=1000 if max_results is None else max_results
         )
-    ]
+
+def _query_tasks(manager: TodoManager, query: QueryArgs) -> dict:
+    """Run query_tasks with normalized arguments"""
+    return manager.query_tasks(
+        query_text=query.query_text,
+        projects=query.projects,
+        contexts=query.contexts,
+        exclude_completed=query.exclude_completed,
+        max_results=query.max_results
+    )
+
+# Tool name -> handler(manager, arguments), looked up once per call
+_TOOL_HANDLERS = {
+    "get_task_overview": lambda manager, args: manager.get_overview(),
+    "suggest_next_task": lambda manager, args: manager.suggest_next_task(
+        time_available_minutes=args.get("time_available_minutes"),
+        context_filter=args.get("context_filter"),
+        energy_level=args.get("energy_level")
+    ),
+    "show_project_tasks": lambda manager, args: manager.get_project_tasks(args["project_name"]),
+    "show_waiting_tasks": lambda manager, args: manager.get_waiting_tasks(),
+    "show_inbox_tasks": lambda manager, args: manager.get_inbox_tasks(),
+    "show_context_tasks": lambda manager, args: manager.get_tasks_by_context(args["context"]),
+    "query_tasks": lambda manager, args: _query_tasks(manager, QueryArgs.from_arguments(args)),
+}
+
+# Tools whose traversal + serialization can be large enough to be worth
+# running off the event loop; for the rest the thread hop costs more
+_OFFLOADED_TOOLS = frozenset({"get_task_overview", "query_tasks"})
+
+def _run_tool(handler, arguments: dict) -> str:
+    """Run a bound tool handler and serialize its result"""
+    return dumps(handler(arguments))
+
+# Handlers bound to the current todo manager by init_todo_manager()
+_bound_handlers: dict = {}
 
 @server.call_tool()
-async def handle_call_tool(name: str, arguments: dict | None) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+async def handle_call_tool(name: str, arguments: dict | None) -> Sequence[TextContent]:
     """Handle tool calls"""
+    arguments = arguments or {}
     
-    if todo_manager is None:
-        return [TextContent(type="text", text="Error: Todo manager not initialized")]
+    handler = _bound_handlers.get(name)
+    if handler is None:
+        if name in _TOOL_HANDLERS:
+            return _NOT_INITIALIZED
+        return [_text(text=f"Error: Unknown tool '{name}'")]
     
-    if arguments is None:
-        arguments = {}
+    missing = [key for key in _REQUIRED_ARGUMENTS[name] if key not in arguments]
+    if missing:
+        return [_text(text=f"Error: Missing required argument(s) for {name}: {', '.join(missing)}")]
+    
+    if _warmup is not None and not _warmup.done():
+        await _warmup
     
     try:
-        if name == "get_task_overview":
-            result = todo_manager.get_overview()
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
-        
-        elif name == "suggest_next_task":
-            result = todo_manager.suggest_next_task(
-                time_available_minutes=arguments.get("time_available_minutes"),
-                context_filter=arguments.get("context_filter"),
-                energy_level=arguments.get("energy_level")
-            )
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+        cache_key = _response_cache_key(name, arguments)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            _response_cache.move_to_end(cache_key)
+            return [_text(text=cached)]
         
-        elif name == "show_project_tasks":
-            project_name = arguments["project_name"]
-            result = todo_manager.get_project_tasks(project_name)
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
-        
-        elif name == "show_waiting_tasks":
-            result = todo_manager.get_waiting_tasks()
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
-        
-        elif name == "show_inbox_tasks":
-            result = todo_manager.get_inbox_tasks()
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
-        
-        elif name == "show_context_tasks":
-            context = arguments["context"]
-            result = todo_manager.get_tasks_by_context(context)
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
-        elif name == "query_tasks":
-            query_text = arguments.get("query_text", "")
-            projects = arguments.get("projects", [])
-            contexts = arguments.get("contexts", [])
-            exclude_completed = arguments.get("exclude_completed", True)
-            max_results = arguments.get("max_results", 1000)
-            result = todo_manager.query_tasks(
-                query_text=query_text,
-                projects=projects,
-                contexts=contexts,
-                exclude_completed=exclude_completed,
-                max_results=max_results
-            )
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+        if name in _OFFLOADED_TOOLS:
+            text = await asyncio.to_thread(_run_tool, handler, arguments)
         else:
-            return [TextContent(type="text", text=f"Error: Unknown tool '{name}'")]
+            text = _run_tool(handler, arguments)
+        _response_cache[cache_key] = text
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+        return [_text(text=text)]
     
     except Exception as e:
-        return [TextContent(type="text", text=f"Error executing {name}: {str(e)}")]
+        return [_text(text=f"Error executing {name}: {str(e)}")]
 
 async def main():
     """Main entry point"""
+    global _warmup
     # Get todo file path from command line or use default
     todo_file = sys.argv[1]
     
     # Initialize todo manager with file path
     init_todo_manager(todo_file)
+    _warmup = asyncio.create_task(asyncio.to_thread(todo_manager.warm_up))
     
-    # Run the server
+    # Run the server; these imports are only needed once the server starts
+    from mcp.server import NotificationOptions
+    from mcp.server.models import InitializationOptions
     from mcp.server.stdio import stdio_server
     
     async with stdio_server() as (read_stream, write_stream):
@@ -233,4 +187,9 @@ async def main():
         )
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # optional speedup, fall back to default event loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
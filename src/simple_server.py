@@ -2,181 +2,127 @@
 Simple MCP Server for Todo.txt management - Single Tool Approach
 """
 import asyncio
-import json
 import sys
-from typing import Any, Sequence
-from mcp.server.models import InitializationOptions
-from mcp.server import NotificationOptions, Server
-from mcp.types import (
-    Resource,
-    Tool,
-    TextContent,
-    ImageContent,
-    EmbeddedResource,
-    LoggingLevel,
-    CallToolRequest,
-    ListToolsRequest
-)
-from todo_manager import TodoManager
+from collections import Counter
+from functools import partial
+from typing import Sequence
+from mcp.server import Server
+from mcp.types import Tool, TextContent
+from serialization import dumps_tasks_response
+from todo_manager import TodoManager, priority_distribution, today_str
+from tools import SIMPLE_TOOLS
 
 # Global todo manager
 todo_manager: TodoManager = None
 
 def init_todo_manager(todo_file_path: str):
     """Initialize the todo manager with file path"""
-    global todo_manager
+    global todo_manager, _warmup
+    _warmup = None
     todo_manager = TodoManager(todo_file_path)
 
+# Background parse of the todo file started by main(), awaited by the first tool call
+_warmup: asyncio.Task | None = None
+
+# Tool responses are always text content
+_text = partial(TextContent, type="text")
+_NOT_INITIALIZED = [_text(text="Error: Todo manager not initialized")]
+
+# get_all_tasks arguments and their defaults, in the order they are reported back
+_FILTER_DEFAULTS = {
+    "include_completed": False,
+    "include_contexts": (),
+    "exclude_contexts": (),
+    "include_projects": (),
+    "exclude_projects": (),
+    "has_due_date": None,
+    "max_results": 100,
+}
+
 # Create server instance
 simple_server = Server("todo-assistant-simple")
 
 @simple_server.list_tools()
 async def handle_list_tools() -> list[Tool]:
     """List available tools - just one generic tool"""
-    return [
-        Tool(
-            name="get_all_tasks",
-            description="Get all tasks from the todo.txt file with optional filtering. Returns complete task data for LLM analysis.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "include_completed": {
-                        "type": "boolean",
-                        "description": "Whether to include completed tasks (default: false)",
-                        "default": False
-                    },
-                    "include_contexts": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Filter by specific contexts (e.g., ['offline', 'low']). If empty, include all contexts."
-                    },
-                    "exclude_contexts": {
-                        "type": "array", 
-                        "items": {"type": "string"},
-                        "description": "Exclude specific contexts (e.g., ['waiting']). If empty, exclude nothing."
-                    },
-                    "include_projects": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Filter by specific projects (e.g., ['work', 'personal']). If empty, include all projects."
-                    },
-                    "exclude_projects": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Exclude specific projects (e.g., ['in']). If empty, exclude nothing."
-                    },
-                    "has_due_date": {
-                        "type": "boolean",
-                        "description": "Filter tasks that have/don't have due dates. If null, include both."
-                    },
-                    "max_results": {
-                        "type": "integer",
-                        "description": "Maximum number of tasks to return (default: 100)",
-                        "default": 100
-                    }
-                },
-                "required": []
-            }
-        )
-    ]
+    return SIMPLE_TOOLS
 
 @simple_server.call_tool()
-async def handle_call_tool(name: str, arguments: dict | None) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+async def handle_call_tool(name: str, arguments: dict | None) -> Sequence[TextContent]:
     """Handle tool calls"""
+    manager = todo_manager
     
-    if todo_manager is None:
-        return [TextContent(type="text", text="Error: Todo manager not initialized")]
+    if manager is None:
+        return _NOT_INITIALIZED
     
     if arguments is None:
         arguments = {}
     
+    if _warmup is not None and not _warmup.done():
+        await _warmup
+    
     try:
         if name == "get_all_tasks":
-            # Extract filtering parameters
-            include_completed = arguments.get("include_completed", False)
-            include_contexts = arguments.get("include_contexts", [])
-            exclude_contexts = arguments.get("exclude_contexts", [])
-            include_projects = arguments.get("include_projects", [])
-            exclude_projects = arguments.get("exclude_projects", [])
-            has_due_date = arguments.get("has_due_date")
-            max_results = arguments.get("max_results", 100)
+            # Extract filtering parameters; the same dict is echoed as filters_applied
+            filters = {key: arguments.get(key, default) for key, default in _FILTER_DEFAULTS.items()}
+            max_results = filters["max_results"]
             
-            # Get filtered tasks
-            tasks = todo_manager.parser.filter_tasks(
-                exclude_contexts=exclude_contexts if exclude_contexts else None,
-                include_contexts=include_contexts if include_contexts else None,
-                exclude_projects=exclude_projects if exclude_projects else None,
-                include_projects=include_projects if include_projects else None,
-                only_active=not include_completed,
-                has_due_date=has_due_date
+            # Get filtered tasks off the event loop; parsing/filtering is CPU-bound
+            tasks = await asyncio.to_thread(
+                manager.filter_tasks,
+                exclude_contexts=filters["exclude_contexts"] or None,
+                include_contexts=filters["include_contexts"] or None,
+                exclude_projects=filters["exclude_projects"] or None,
+                include_projects=filters["include_projects"] or None,
+                only_active=not filters["include_completed"],
+                has_due_date=filters["has_due_date"],
+                max_results=max_results or None
             )
             
-            # Limit results
-            if max_results and len(tasks) > max_results:
-                tasks = tasks[:max_results]
-            
-            # Build comprehensive response with metadata
-            result = {
-                "tasks": tasks,
-                "metadata": {
-                    "total_returned": len(tasks),
-                    "filters_applied": {
-                        "include_completed": include_completed,
-                        "include_contexts": include_contexts,
-                        "exclude_contexts": exclude_contexts,
-                        "include_projects": include_projects,
-                        "exclude_projects": exclude_projects,
-                        "has_due_date": has_due_date,
-                        "max_results": max_results
-                    },
-                    "summary": _get_quick_summary(tasks)
-                }
+            # Build response metadata; the summary is an extra pass, so only on request
+            metadata = {
+                "total_returned": len(tasks),
+                "filters_applied": filters
             }
+            if arguments.get("include_summary", False):
+                metadata["summary"] = _get_quick_summary(tasks)
             
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+            return [_text(text=dumps_tasks_response(tasks, metadata))]
         
         else:
-            return [TextContent(type="text", text=f"Error: Unknown tool '{name}'")]
+            return [_text(text=f"Error: Unknown tool '{name}'")]
     
     except Exception as e:
-        return [TextContent(type="text", text=f"Error executing {name}: {str(e)}")]
+        return [_text(text=f"Error executing {name}: {str(e)}")]
 
 def _get_quick_summary(tasks) -> dict:
     """Generate quick summary statistics for the returned tasks"""
     if not tasks:
         return {"message": "No tasks found"}
     
-    # Count by priority
-    priority_counts = {}
+    # Gather all counters in a single pass over the tasks
+    today = today_str()
+    priority_counts = Counter()
+    project_counts = Counter()
+    context_counts = Counter()
+    due_today = overdue = with_due_dates = 0
     for task in tasks:
-        priority = task['priority'] or 'No Priority'
-        priority_counts[priority] = priority_counts.get(priority, 0) + 1
-    
-    # Count by project (top 10)
-    project_counts = {}
-    for task in tasks:
-        for project in task['projects']:
-            project_counts[project] = project_counts.get(project, 0) + 1
-    top_projects = dict(sorted(project_counts.items(), key=lambda x: x[1], reverse=True)[:10])
-    
-    # Count by context
-    context_counts = {}
-    for task in tasks:
-        for context in task['contexts']:
-            context_counts[context] = context_counts.get(context, 0) + 1
-    
-    # Due date analysis
-    from datetime import datetime
-    today = datetime.now().strftime('%Y-%m-%d')
-    due_today = sum(1 for t in tasks if t['due_date'] == today)
-    overdue = sum(1 for t in tasks if t['due_date'] and t['due_date'] < today)
-    with_due_dates = sum(1 for t in tasks if t['due_date'])
+        priority_counts[task['priority'] or 'No Priority'] += 1
+        project_counts.update(task['projects'])
+        context_counts.update(task['contexts'])
+        due_date = task['due_date']
+        if due_date:
+            with_due_dates += 1
+            if due_date == today:
+                due_today += 1
+            elif due_date < today:
+                overdue += 1
     
     return {
         "task_count": len(tasks),
-        "priority_distribution": priority_counts,
-        "top_projects": top_projects,
-        "contexts": context_counts,
+        "priority_distribution": priority_distribution(priority_counts),
+        "top_projects": dict(project_counts.most_common(10)),
+        "contexts": dict(context_counts),
         "due_date_info": {
             "with_due_dates": with_due_dates,
             "due_today": due_today,
@@ -186,13 +132,17 @@ def _get_quick_summary(tasks) -> dict:
 
 async def main():
     """Main entry point for simple server"""
+    global _warmup
     # Get todo file path from command line or use default
     todo_file = sys.argv[1]
     
     # Initialize todo manager with file path
     init_todo_manager(todo_file)
+    _warmup = asyncio.create_task(asyncio.to_thread(todo_manager.warm_up))
     
-    # Run the server
+    # Run the server; these imports are only needed once the server starts
+    from mcp.server import NotificationOptions
+    from mcp.server.models import InitializationOptions
     from mcp.server.stdio import stdio_server
     
     async with stdio_server() as (read_stream, write_stream):
@@ -210,4 +160,9 @@ async def main():
         )
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:  # optional speedup, fall back to default event loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
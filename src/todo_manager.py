@@ -1,47 +1,127 @@
 """
 High-level todo management with business logic
 """
-from datetime import datetime, timedelta
+import sys
+import time
+from collections import Counter, OrderedDict, defaultdict
+from datetime import date, timedelta
 from typing import Dict, List, Any, Optional
 from todo_parser import TodoParser
 
+# (epoch second, date string) of the last today_str() computation
+_today_cache = (0, '')
+
+def today_str() -> str:
+    """Today's date as YYYY-MM-DD, recomputed at most once per second"""
+    global _today_cache
+    now = int(time.time())
+    if now != _today_cache[0]:
+        # Interned like parsed due dates, so date comparisons can short-circuit on identity
+        _today_cache = (now, sys.intern(date.today().isoformat()))
+    return _today_cache[1]
+
+# Energy and time context mappings used by suggest_next_task
+ENERGY_CONTEXTS = {
+    'high': frozenset({'focus', 'creative', 'complex', 'brainstorm', 'learn'}),
+    'medium': frozenset({'medium'}),  # Neutral tasks
+    'low': frozenset({'routine', 'admin', 'communicate', 'organize', 'review'})
+}
+
+TIME_CONTEXTS = {
+    'quick': frozenset({'quick', 'call', 'email'}),   # ≤15 min
+    'medium': frozenset({'medium', 'meeting'}),       # 15-60 min
+    'long': frozenset({'deep', 'project'})            # >60 min
+}
+
+def priority_distribution(priority_counts: Counter) -> Dict[str, int]:
+    """Priority counts ordered A-Z, with 'No Priority' last"""
+    return dict(sorted(priority_counts.items(), key=lambda item: (item[0] == 'No Priority', item[0])))
+
+# Number of distinct filter_tasks results kept per parse (LRU); filters
+# come from client arguments, so the set of keys is unbounded
+FILTER_CACHE_SIZE = 64
+
 class TodoManager:
+    __slots__ = ('parser', '_filter_source', '_filter_cache')
+
     def __init__(self, todo_file: str):
         self.parser = TodoParser(todo_file)
+        # filter_tasks results for the currently parsed task list
+        self._filter_source = None
+        self._filter_cache = OrderedDict()
+
+    def filter_tasks(self, **filters) -> List[Dict[str, Any]]:
+        """Filter tasks via the parser, memoized until the todo file changes.
+
+        Returned lists are shared between callers and must not be modified.
+        """
+        tasks = self.parser.load_all_tasks()
+        if tasks is not self._filter_source:
+            # File was re-parsed, previous results are stale
+            self._filter_source = tasks
+            self._filter_cache.clear()
+        
+        key = tuple(sorted(
+            (name, tuple(value) if isinstance(value, (list, tuple)) else value)
+            for name, value in filters.items()
+        ))
+        cached = self._filter_cache.get(key)
+        if cached is not None:
+            self._filter_cache.move_to_end(key)
+            return cached
+        cached = self._filter_cache[key] = self.parser.filter_tasks(**filters)
+        if len(self._filter_cache) > FILTER_CACHE_SIZE:
+            self._filter_cache.popitem(last=False)
+        return cached
+
+    def warm_up(self) -> None:
+        """Load and parse the todo file ahead of the first tool call"""
+        try:
+            self.parser.load_all_tasks()
+        except Exception:
+            pass  # reported by the tool call that hits the same error
 
     def get_overview(self) -> Dict[str, Any]:
         """Get comprehensive task overview"""
         all_tasks = self.parser.load_all_tasks()
-        active_tasks = [t for t in all_tasks if not t['completed']]
-        main_tasks = self.parser.filter_tasks(exclude_contexts=['waiting'])
-        
-        # Priority distribution
-        priority_counts = {}
-        for task in main_tasks:
-            priority = task['priority'] or 'No Priority'
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-        
-        # Project distribution (exclude inbox)
-        project_counts = {}
-        for task in active_tasks:
-            for project in task['projects']:
-                if project != 'in':
-                    project_counts[project] = project_counts.get(project, 0) + 1
+        today = today_str()
         
-        # Due date analysis
-        today = datetime.now().strftime('%Y-%m-%d')
-        due_today = sum(1 for t in main_tasks if t['due_date'] == today)
-        overdue = sum(1 for t in main_tasks if t['due_date'] and t['due_date'] < today)
+        # Bucket counts, distributions and due date analysis in one scan:
+        # main tasks are active tasks that are not waiting
+        active_count = main_count = waiting_count = inbox_count = 0
+        due_today = overdue = 0
+        priority_counts = Counter()
+        project_counts = Counter()
+        for task in all_tasks:
+            if task['completed']:
+                continue
+            active_count += 1
+            if 'in' in task.projects_set:
+                inbox_count += 1
+            # Project distribution (exclude inbox)
+            project_counts.update(project for project in task['projects'] if project != 'in')
+            
+            if 'waiting' in task.contexts_set:
+                waiting_count += 1
+                continue
+            main_count += 1
+            priority_counts[task['priority'] or 'No Priority'] += 1
+            due_date = task['due_date']
+            if due_date:
+                if due_date == today:
+                    due_today += 1
+                elif due_date < today:
+                    overdue += 1
         
         return {
             'total_tasks': len(all_tasks),
-            'active_tasks': len(active_tasks),
-            'completed_tasks': len(all_tasks) - len(active_tasks),
-            'main_tasks': len(main_tasks),
-            'waiting_tasks': len(self.parser.filter_tasks(include_contexts=['waiting'])),
-            'inbox_tasks': len([t for t in active_tasks if 'in' in t['projects']]),
-            'priority_distribution': priority_counts,
-            'top_projects': dict(sorted(project_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
+            'active_tasks': active_count,
+            'completed_tasks': len(all_tasks) - active_count,
+            'main_tasks': main_count,
+            'waiting_tasks': waiting_count,
+            'inbox_tasks': inbox_count,
+            'priority_distribution': priority_distribution(priority_counts),
+            'top_projects': dict(project_counts.most_common(10)),
             'due_today': due_today,
             'overdue': overdue
         }
@@ -52,24 +132,11 @@ class TodoManager:
                         energy_level: Optional[str] = None) -> Dict[str, Any]:
         """Suggest next task with reasoning"""
         
-        # Define energy and time context mappings
-        ENERGY_CONTEXTS = {
-            'high': ['focus', 'creative', 'complex', 'brainstorm', 'learn'],
-            'medium': ['medium'],  # Neutral tasks
-            'low': ['routine', 'admin', 'communicate', 'organize', 'review']
-        }
-        
-        TIME_CONTEXTS = {
-            'quick': ['quick', 'call', 'email'],        # ≤15 min
-            'medium': ['medium', 'meeting'],             # 15-60 min  
-            'long': ['deep', 'project']                  # >60 min
-        }
-        
         filters = {'exclude_contexts': ['waiting']}
         if context_filter:
             filters['include_contexts'] = [context_filter]
         
-        tasks = self.parser.filter_tasks(**filters)
+        tasks = self.filter_tasks(**filters)
         
         if not tasks:
             return {'error': 'No available tasks found'}
@@ -79,9 +146,9 @@ class TodoManager:
         
         # Filter by energy level
         if energy_level and energy_level in ENERGY_CONTEXTS:
-            energy_tasks = [task for task in candidate_tasks 
-                        if any(ctx in ENERGY_CONTEXTS[energy_level] 
-                                for ctx in task['contexts'])]
+            energy_contexts = ENERGY_CONTEXTS[energy_level]
+            energy_tasks = [task for task in candidate_tasks
+                            if task.contexts_set & energy_contexts]
             if energy_tasks:
                 candidate_tasks = energy_tasks
                 filtering_reasons.append(f"filtered for {energy_level} energy tasks")
@@ -96,9 +163,9 @@ class TodoManager:
             else:
                 target_time_category = 'long'
             
-            time_tasks = [task for task in candidate_tasks 
-                        if any(ctx in TIME_CONTEXTS[target_time_category] 
-                            for ctx in task['contexts'])]
+            time_contexts = TIME_CONTEXTS[target_time_category]
+            time_tasks = [task for task in candidate_tasks
+                          if task.contexts_set & time_contexts]
             if time_tasks:
                 candidate_tasks = time_tasks
                 filtering_reasons.append(f"filtered for {target_time_category} duration tasks")
@@ -115,7 +182,7 @@ class TodoManager:
         # Build reasoning
         reasons = []
         if suggested['due_date']:
-            today = datetime.now().strftime('%Y-%m-%d')
+            today = today_str()
             if suggested['due_date'] <= today:
                 reasons.append('Due today or overdue')
             else:
@@ -148,8 +215,8 @@ class TodoManager:
 
     def get_project_tasks(self, project_name: str) -> Dict[str, Any]:
         """Get all tasks for a specific project"""
-        active_tasks = self.parser.filter_tasks(include_projects=[project_name])
-        waiting_tasks = self.parser.filter_tasks(
+        active_tasks = self.filter_tasks(include_projects=[project_name])
+        waiting_tasks = self.filter_tasks(
             include_projects=[project_name],
             include_contexts=['waiting']
         )
@@ -163,26 +230,23 @@ class TodoManager:
     
     def get_waiting_tasks(self) -> Dict[str, Any]:
         """Get all waiting/blocked tasks organized by project"""
-        waiting_tasks = self.parser.filter_tasks(include_contexts=['waiting'])
+        waiting_tasks = self.filter_tasks(include_contexts=['waiting'])
         
         # Group by project
-        by_project = {}
+        by_project = defaultdict(list)
         for task in waiting_tasks:
-            projects = task['projects'] if task['projects'] else ['No Project']
-            for project in projects:
-                if project not in by_project:
-                    by_project[project] = []
+            for project in task['projects'] or ('No Project',):
                 by_project[project].append(task)
         
         return {
             'waiting_tasks': waiting_tasks,
-            'by_project': by_project,
+            'by_project': dict(by_project),
             'total_count': len(waiting_tasks)
         }
     
     def get_inbox_tasks(self) -> Dict[str, Any]:
         """Get all inbox tasks needing processing"""
-        inbox_tasks = self.parser.filter_tasks(include_projects=['in'])
+        inbox_tasks = self.filter_tasks(include_projects=['in'])
         
         return {
             'inbox_tasks': inbox_tasks,
@@ -192,7 +256,7 @@ class TodoManager:
     
     def get_tasks_by_context(self, context: str) -> Dict[str, Any]:
         """Get tasks filtered by specific context"""
-        tasks = self.parser.filter_tasks(include_contexts=[context])
+        tasks = self.filter_tasks(include_contexts=[context])
         
         return {
             'context': context,
@@ -218,37 +282,20 @@ class TodoManager:
             filters['include_projects'] = projects
         if contexts:
             filters['include_contexts'] = contexts
+        # Without a text search the limit can be applied while filtering; one
+        # extra task is kept so truncation can still be detected below
+        if max_results and not query_text:
+            filters['max_results'] = max_results + 1
             
         # Get filtered tasks
-        tasks = self.parser.filter_tasks(**filters)
+        tasks = self.filter_tasks(**filters)
         
-        # Apply text search if query_text is provided
+        # Apply text search if query_text is provided. Projects and contexts
+        # are part of the raw line, so matching raw text also covers them.
         if query_text:
             query_lower = query_text.lower()
-            matching_tasks = []
-            
-            for task in tasks:
-                # Search in description (cleaned task text)
-                if query_lower in task['description'].lower():
-                    matching_tasks.append(task)
-                    continue
-                
-                # Search in raw task text
-                if query_lower in task['raw'].lower():
-                    matching_tasks.append(task)
-                    continue
-                    
-                # Search in projects
-                if any(query_lower in proj.lower() for proj in task['projects']):
-                    matching_tasks.append(task)
-                    continue
-                    
-                # Search in contexts
-                if any(query_lower in ctx.lower() for ctx in task['contexts']):
-                    matching_tasks.append(task)
-                    continue
-                    
-            tasks = matching_tasks
+            tasks = [task for task in tasks
+                     if query_lower in task.description_lower or query_lower in task.raw_lower]
         
         # Limit results
         if max_results and len(tasks) > max_results:
@@ -1,15 +1,59 @@
 """
 Todo.txt parser with filtering and sorting capabilities
 """
+import heapq
 import re
 import json
+import sys
 from datetime import datetime
+from operator import attrgetter
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+# Patterns used by parse_line, compiled once at import. Lines are split into
+# whitespace-separated tokens; these only validate/extract within a token.
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}', re.ASCII)
+_PRIO_RE = re.compile(r'\(([A-Z])\)')
+_NAME_RE = re.compile(r'\w+')
+_REC_RE = re.compile(r'\+?\w+')
+
+# Task.sort_key packs (due date, priority, line number) into one int:
+# YYYYMMDD << 42 | priority << 32 | line number. The low bits hold 999 until
+# load_all_tasks fills in the real line number (tasks parsed on their own
+# sort after numbered ones, as with the old tuple key).
+_NO_DUE_DATE_KEY = 10 ** 8     # after any YYYYMMDD
+_NO_PRIORITY_KEY = 999         # after A=1 .. Z=26
+_LINE_MASK = (1 << 32) - 1
+_sort_key = attrgetter('sort_key')
+
+class Task(dict):
+    """Parsed todo.txt task.
+
+    Behaves as a plain dict for callers and JSON serialization; derived
+    lookup data lives in slots so it never shows up in serialized output.
+    """
+    __slots__ = ('contexts_set', 'projects_set', 'description_lower', 'raw_lower', 'encoded', 'sort_key')
+
+    def at_line(self, line_number: int) -> 'Task':
+        """Copy of this task moved to another line of the file"""
+        task = Task(self)
+        task['line_number'] = line_number
+        task.contexts_set = self.contexts_set
+        task.projects_set = self.projects_set
+        task.description_lower = self.description_lower
+        task.raw_lower = self.raw_lower
+        task.encoded = None
+        task.sort_key = self.sort_key & ~_LINE_MASK | line_number
+        return task
+
+
 class TodoParser:
     def __init__(self, todo_file: str):
         self.todo_file = Path(todo_file)
+        # ((mtime_ns, size), tasks) from the last parse; reused while the file is unchanged
+        self._cache = None
+        # Raw line -> task from the last parse, so a changed file only re-parses changed lines
+        self._line_cache = {}
     
     def parse_line(self, line: str) -> Optional[Dict[str, Any]]:
         """Parse single todo.txt line into structured data"""
@@ -17,7 +61,7 @@ class TodoParser:
         if not line:
             return None
             
-        task = {
+        task = Task({
             'raw': line,
             'completed': line.startswith('x '),
             'priority': None,
@@ -26,79 +70,142 @@ class TodoParser:
             'due_date': None,
             'threshold_date': None,
             'recurrence': None,
-            'description': self._clean_description(line),
+            'description': '',  # filled in from the tokens below
             'creation_date': None,
             'completion_date': None
-        }
+        })
+        
+        # Single pass over whitespace-separated tokens; projects, contexts and
+        # key:value metadata are recognized by how a token starts. Tokens that
+        # are not metadata make up the description.
+        tokens = line.split()
+        projects = task['projects']
+        contexts = task['contexts']
+        description = []
+        start = 0
         
         # Extract completion date and creation date for completed tasks
         if task['completed']:
             # Format: x 2024-01-15 2024-01-10 task description
-            date_pattern = r'^x\s+(\d{4}-\d{2}-\d{2})(?:\s+(\d{4}-\d{2}-\d{2}))?'
-            match = re.match(date_pattern, line)
+            match = _DATE_RE.match(tokens[1])
             if match:
-                task['completion_date'] = match.group(1)
-                if match.group(2):
-                    task['creation_date'] = match.group(2)
+                task['completion_date'] = match.group()
+                start = 2
+                if len(tokens[1]) == 10 and len(tokens) > 2:
+                    match = _DATE_RE.match(tokens[2])
+                    if match:
+                        task['creation_date'] = match.group()
+                        start = 3
         
-        # Extract priority for active tasks
-        if not task['completed']:
-            priority_match = re.match(r'^(\([A-Z]\))', line)
+        # Extract priority; only active tasks keep it, but it is never part of the description
+        if start < len(tokens) and tokens[start][0] == '(':
+            priority_match = _PRIO_RE.match(tokens[start])
             if priority_match:
-                task['priority'] = priority_match.group(1)[1:-1]
-        
-# Extract projects (+project) - exclude rec:+1d patterns
-        task['projects'] = re.findall(r'(?<!:)\+(\w+)', line)
+                if not task['completed']:
+                    # Priorities, tags, dates and recurrences repeat across tasks; interning
+                    # them shares one string object per value and makes equality checks cheap
+                    task['priority'] = sys.intern(priority_match.group(1))
+                rest = tokens[start][3:]
+                if rest:
+                    description.append(rest)
+                start += 1
         
-        # Extract contexts (@context)  
-        task['contexts'] = re.findall(r'@(\w+)', line)
+        for token in tokens[start:]:
+            head = token[0]
+            if head == '+':
+                # Project (+project); rec:+1d does not start a token with '+'
+                match = _NAME_RE.match(token, 1)
+                if match:
+                    projects.append(sys.intern(match.group()))
+            elif head == '@':
+                # Context (@context)
+                match = _NAME_RE.match(token, 1)
+                if match:
+                    contexts.append(sys.intern(match.group()))
+            elif head == 'd' and token.startswith('due:'):
+                # Due date
+                match = _DATE_RE.match(token, 4)
+                if match:
+                    if task['due_date'] is None:
+                        task['due_date'] = sys.intern(match.group())
+                    continue
+            elif head == 't' and token.startswith('t:'):
+                # Threshold date
+                match = _DATE_RE.match(token, 2)
+                if match:
+                    if task['threshold_date'] is None:
+                        task['threshold_date'] = sys.intern(match.group())
+                    continue
+            elif head == 'r' and token.startswith('rec:'):
+                # Recurrence
+                match = _REC_RE.match(token, 4)
+                if match:
+                    if task['recurrence'] is None:
+                        task['recurrence'] = sys.intern(match.group())
+                    continue
+            description.append(token)
+        task['description'] = ' '.join(description)
         
-        # Extract due date
-        due_match = re.search(r'due:(\d{4}-\d{2}-\d{2})', line)
-        if due_match:
-            task['due_date'] = due_match.group(1)
-            
-        # Extract threshold date
-        threshold_match = re.search(r't:(\d{4}-\d{2}-\d{2})', line)
-        if threshold_match:
-            task['threshold_date'] = threshold_match.group(1)
-            
-        # Extract recurrence
-        rec_match = re.search(r'rec:(\+?\w+)', line)
-        if rec_match:
-            task['recurrence'] = rec_match.group(1)
+        # Precomputed sets for fast membership/intersection checks in filters
+        task.contexts_set = frozenset(task['contexts'])
+        task.projects_set = frozenset(task['projects'])
+        # Lowercased text for case-insensitive search in query_tasks
+        task.description_lower = task['description'].lower()
+        task.raw_lower = line.lower()
+        # JSON encoding, filled in on first serialization (see serialization.py)
+        task.encoded = None
+        # Single-int sort key, compared in C by sort_tasks
+        due_date = task['due_date']
+        priority = task['priority']
+        due_key = int(due_date[:4] + due_date[5:7] + due_date[8:]) if due_date else _NO_DUE_DATE_KEY
+        priority_key = ord(priority) - 64 if priority else _NO_PRIORITY_KEY
+        task.sort_key = due_key << 42 | priority_key << 32 | 999
             
         return task
     
-    def _clean_description(self, line: str) -> str:
-        """Clean description by removing metadata"""
-        # Remove completion marker and dates
-        clean = re.sub(r'^x\s+\d{4}-\d{2}-\d{2}(?:\s+\d{4}-\d{2}-\d{2})?\s*', '', line)
-        # Remove priority
-        clean = re.sub(r'^\([A-Z]\)\s*', '', clean)
-        # Remove metadata
-        clean = re.sub(r'\s+due:\d{4}-\d{2}-\d{2}', '', clean)
-        clean = re.sub(r'\s+t:\d{4}-\d{2}-\d{2}', '', clean)
-        clean = re.sub(r'\s+rec:\+?\w+', '', clean)
-        return clean.strip()
-    
     def load_all_tasks(self) -> List[Dict[str, Any]]:
-        """Load and parse all tasks from file"""
-        if not self.todo_file.exists():
+        """Load and parse all tasks from file, reusing the last parse if unchanged.
+
+        The returned list (and its tasks) is shared with the cache, so callers
+        must not modify it; TodoManager relies on its identity to tell when
+        the file was re-parsed.
+        """
+        try:
+            stat = self.todo_file.stat()
+        except (FileNotFoundError, NotADirectoryError):
             return []
+        
+        # Size guards against rewrites landing within the filesystem's mtime granularity
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        if self._cache is not None and self._cache[0] == file_key:
+            return self._cache[1]
             
         try:
             with open(self.todo_file, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
-        except Exception as e:
-            raise Exception(f"Error reading todo file: {e}")
+        except FileNotFoundError:
+            # Removed since the stat above
+            return []
             
         tasks = []
+        previous = self._line_cache
+        line_cache = {}
         for i, line in enumerate(lines):
-            task = self.parse_line(line)
-            if task:
-                task['line_number'] = i + 1
-                tasks.append(task)
+            line_number = i + 1
+            task = previous.get(line)
+            if task is None:
+                task = self.parse_line(line)
+                if not task:
+                    continue
+                task['line_number'] = line_number
+                task.sort_key = task.sort_key & ~_LINE_MASK | line_number
+            elif task['line_number'] != line_number:
+                # Unchanged line that moved; tasks are shared, so copy instead of renumbering
+                task = task.at_line(line_number)
+            line_cache[line] = task
+            tasks.append(task)
+        self._line_cache = line_cache
+        self._cache = (file_key, tasks)
         return tasks
     
     def filter_tasks(self, 
@@ -107,12 +214,19 @@ class TodoParser:
                     exclude_projects: List[str] = None,
                     include_projects: List[str] = None,
                     only_active: bool = True,
-                    has_due_date: bool = None) -> List[Dict[str, Any]]:
-        """Filter tasks with multiple criteria"""
-        exclude_contexts = exclude_contexts or []
-        include_contexts = include_contexts or []
-        exclude_projects = exclude_projects or []
-        include_projects = include_projects or []
+                    has_due_date: bool = None,
+                    max_results: int = None) -> List[Dict[str, Any]]:
+        """Filter tasks with multiple criteria.
+
+        With max_results, only the first max_results tasks in sort order are
+        returned, selected without sorting every match.
+        """
+        # Sets so each task is checked against its precomputed context/project
+        # sets with a single C-level disjointness test
+        exclude_contexts = frozenset(exclude_contexts or ())
+        include_contexts = frozenset(include_contexts or ())
+        exclude_projects = frozenset(exclude_projects or ())
+        include_projects = frozenset(include_projects or ())
         
         tasks = self.load_all_tasks()
         filtered = []
@@ -127,17 +241,17 @@ class TodoParser:
                 continue
                 
             # Context filters
-            if exclude_contexts and any(ctx in task['contexts'] for ctx in exclude_contexts):
+            if exclude_contexts and not exclude_contexts.isdisjoint(task.contexts_set):
                 continue
                 
-            if include_contexts and not any(ctx in task['contexts'] for ctx in include_contexts):
+            if include_contexts and include_contexts.isdisjoint(task.contexts_set):
                 continue
                 
             # Project filters
-            if exclude_projects and any(proj in task['projects'] for proj in exclude_projects):
+            if exclude_projects and not exclude_projects.isdisjoint(task.projects_set):
                 continue
                 
-            if include_projects and not any(proj in task['projects'] for proj in include_projects):
+            if include_projects and include_projects.isdisjoint(task.projects_set):
                 continue
                 
             # Due date filter
@@ -149,26 +263,16 @@ class TodoParser:
                 
             filtered.append(task)
         
-        return self.sort_tasks(filtered)
+        if max_results is not None and max_results < len(filtered):
+            return heapq.nsmallest(max_results, filtered, key=_sort_key)
+        # filtered is our own list, so sort it in place rather than copying it
+        filtered.sort(key=_sort_key)
+        return filtered
     
     def sort_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Sort tasks: due dates first, then by priority (mimicking topydo)"""
-        def sort_key(task):
-            # Due date first (None goes to end)
-            if task['due_date']:
-                due_sort = task['due_date']
-            else:
-                due_sort = 'zzzz-12-31'  # Far future date
-            
-            # Priority second (A=1, B=2, etc., None=999)
-            if task['priority']:
-                priority_sort = ord(task['priority']) - ord('A') + 1
-            else:
-                priority_sort = 999
-                
-            # Line number as tiebreaker (original order)
-            line_sort = task.get('line_number', 999)
-                
-            return (due_sort, priority_sort, line_sort)
-            
-        return sorted(tasks, key=sort_key)
+        """Sort tasks: due dates first, then by priority (mimicking topydo)
+
+        Uses the packed key computed at parse time: due date (none last),
+        then priority (A first, none last), then original line order.
+        """
+        return sorted(tasks, key=_sort_key)
@@ -0,0 +1,175 @@
+"""
+MCP tool definitions, built once at import and shared by the servers
+"""
+from mcp.types import Tool
+
+# Tool input schemas, shared by the tool definitions below
+_EMPTY_SCHEMA = {
+    "type": "object",
+    "properties": {},
+    "required": []
+}
+
+_SUGGEST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "time_available_minutes": {
+            "type": "integer",
+            "description": "How many minutes are available for work"
+        },
+        "context_filter": {
+            "type": "string", 
+            "description": "Filter by context (e.g., 'offline', 'low')"
+        },
+        "energy_level": {
+            "type": "string",
+            "description": "Current energy level (high, medium, low)"
+        }
+    },
+    "required": []
+}
+
+_PROJECT_SCHEMA = {
+    "type": "object", 
+    "properties": {
+        "project_name": {
+            "type": "string",
+            "description": "Name of the project (without + prefix)"
+        }
+    },
+    "required": ["project_name"]
+}
+
+_CONTEXT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "context": {
+            "type": "string",
+            "description": "Context to filter by (e.g., 'offline', 'low', 'waiting')"
+        }
+    },
+    "required": ["context"]
+}
+
+_QUERY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query_text": {
+            "type": "string",
+            "description": "Search text to find in task descriptions (partial match, case-insensitive)"
+        },
+        "projects": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Filter by specific projects (e.g., ['work', 'personal']). If empty, include all projects."
+        },
+        "contexts": {
+            "type": "array", 
+            "items": {"type": "string"},
+            "description": "Filter by specific contexts (e.g., ['focus', 'offline']). If empty, include all contexts."
+        },
+        "exclude_completed": {
+            "type": "boolean",
+            "description": "Whether to exclude completed tasks (default: true)",
+            "default": True
+        },
+        "max_results": {
+            "type": "integer",
+            "description": "Maximum number of results to return (default: 1000)",
+            "default": 1000
+        }
+    },
+    "required": []
+}
+
+# Tools exposed by the multi-tool server (server.py)
+TOOLS: list[Tool] = [
+    Tool(
+        name="get_task_overview",
+        description="Get comprehensive overview of all tasks including counts, priorities, and project status",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    Tool(
+        name="suggest_next_task", 
+        description="Suggest the next task to work on based on priorities, due dates, and constraints",
+        inputSchema=_SUGGEST_SCHEMA
+    ),
+    Tool(
+        name="show_project_tasks",
+        description="Show all tasks for a specific project",
+        inputSchema=_PROJECT_SCHEMA
+    ),
+    Tool(
+        name="show_waiting_tasks",
+        description="Show all tasks that are waiting/blocked, organized by project",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    Tool(
+        name="show_inbox_tasks",
+        description="Show all inbox tasks that need to be processed",
+        inputSchema=_EMPTY_SCHEMA
+    ),
+    Tool(
+        name="show_context_tasks",
+        description="Show tasks filtered by specific context",
+        inputSchema=_CONTEXT_SCHEMA
+    ),
+    Tool(
+        name="query_tasks",
+        description="Generic query interface for searching tasks by project, context, or task name with flexible filtering",
+        inputSchema=_QUERY_SCHEMA
+    )
+]
+
+# Single generic tool exposed by the simple server (simple_server.py)
+SIMPLE_TOOLS: list[Tool] = [
+    Tool(
+        name="get_all_tasks",
+        description="Get all tasks from the todo.txt file with optional filtering. Returns complete task data for LLM analysis.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "include_completed": {
+                    "type": "boolean",
+                    "description": "Whether to include completed tasks (default: false)",
+                    "default": False
+                },
+                "include_contexts": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Filter by specific contexts (e.g., ['offline', 'low']). If empty, include all contexts."
+                },
+                "exclude_contexts": {
+                    "type": "array", 
+                    "items": {"type": "string"},
+                    "description": "Exclude specific contexts (e.g., ['waiting']). If empty, exclude nothing."
+                },
+                "include_projects": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Filter by specific projects (e.g., ['work', 'personal']). If empty, include all projects."
+                },
+                "exclude_projects": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Exclude specific projects (e.g., ['in']). If empty, exclude nothing."
+                },
+                "has_due_date": {
+                    "type": "boolean",
+                    "description": "Filter tasks that have/don't have due dates. If null, include both."
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of tasks to return (default: 100)",
+                    "default": 100
+                },
+                "include_summary": {
+                    "type": "boolean",
+                    "description": "Whether to add summary statistics for the returned tasks to the metadata (default: false)",
+                    "default": False
+                }
+            },
+            "required": []
+        }
+    )
+]
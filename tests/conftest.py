@@ -1,9 +1,19 @@
 """
 Pytest configuration and fixtures
 """
+import shutil
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add src directory to Python path for all tests
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
+
+@pytest.fixture(scope="session")
+def sample_todo_file(tmp_path_factory):
+    """Session copy of the sample todo file, so tests cannot modify the tracked fixture"""
+    todo_file = tmp_path_factory.mktemp("todo") / "sample_todo.txt"
+    shutil.copy(Path(__file__).parent / "fixtures" / "sample_todo.txt", todo_file)
+    return str(todo_file)
@@ -0,0 +1,45 @@
+"""
+Helpers shared by the server tests
+"""
+import json
+import threading
+from contextlib import asynccontextmanager
+
+import mcp.server.stdio
+from serialization import orjson
+from todo_manager import TodoManager
+
+def loads(text: str):
+    """Decode a JSON tool response, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def response_data(result):
+    """Decode the single text content of a tool response"""
+    assert len(result) == 1
+    return loads(result[0].text)
+
+def gate_warm_up(monkeypatch) -> threading.Event:
+    """Hold TodoManager.warm_up in its worker thread until the returned event is set"""
+    release = threading.Event()
+    warm_up = TodoManager.warm_up
+    
+    def gated_warm_up(manager):
+        release.wait(5)
+        warm_up(manager)
+    
+    monkeypatch.setattr(TodoManager, "warm_up", gated_warm_up)
+    return release
+
+def stub_stdio(monkeypatch, server) -> None:
+    """Make a server's main() return right after startup instead of serving stdio"""
+    @asynccontextmanager
+    async def stdio_server():
+        yield None, None
+    
+    async def run(*args, **kwargs):
+        pass
+    
+    monkeypatch.setattr(mcp.server.stdio, "stdio_server", stdio_server)
+    monkeypatch.setattr(server, "run", run)
@@ -3,13 +3,8 @@ Test enhanced task suggestion functionality with energy and time contexts
 """
 import pytest
 import json
-from pathlib import Path
 from todo_manager import TodoManager
 
-@pytest.fixture
-def sample_todo_file():
-    return str(Path(__file__).parent / "fixtures" / "sample_todo.txt")
-
 @pytest.fixture
 def manager(sample_todo_file):
     return TodoManager(sample_todo_file)
@@ -1,14 +1,11 @@
 """
 Test todo parser functionality
 """
+import json
+import os
 import pytest
-from pathlib import Path
 from todo_parser import TodoParser
 
-@pytest.fixture
-def sample_todo_file():
-    return Path(__file__).parent / "fixtures" / "sample_todo.txt"
-
 @pytest.fixture 
 def parser(sample_todo_file):
     return TodoParser(str(sample_todo_file))
@@ -75,6 +72,29 @@ def test_task_sorting(parser):
         assert second_task['priority'] == 'A'
         assert second_task['due_date'] == '2024-12-23'
 
+def test_task_sorting_tiebreaks(tmp_path):
+    """Test ordering by due date, then priority, then line order"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text(
+        "no date no priority\n"
+        "(B) no date\n"
+        "late due:2025-01-01\n"
+        "(Z) early due:2024-06-01\n"
+        "(A) early due:2024-06-01\n"
+        "another no date no priority\n"
+    )
+    parser = TodoParser(str(todo_file))
+    
+    tasks = parser.sort_tasks(parser.load_all_tasks())
+    
+    assert [task['line_number'] for task in tasks] == [5, 4, 3, 2, 1, 6]
+
+def test_filter_max_results_keeps_sort_order(parser):
+    """Test that max_results returns the leading tasks of the full sorted result"""
+    all_tasks = parser.filter_tasks()
+    
+    assert parser.filter_tasks(max_results=3) == all_tasks[:3]
+    assert parser.filter_tasks(max_results=len(all_tasks) + 5) == all_tasks
 
 def test_project_filtering(parser):
     """Test filtering by specific project"""
@@ -141,3 +161,117 @@ def test_filter_by_time_contexts(parser):
     deep_tasks = parser.filter_tasks(include_contexts=['deep'])
     for task in deep_tasks:
         assert 'deep' in task['contexts']
+
+def test_load_all_tasks_cached_until_file_changes(tmp_path):
+    """Test that parsed tasks are reused until the file is modified"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text("first task +work\n")
+    parser = TodoParser(str(todo_file))
+    
+    first = parser.load_all_tasks()
+    assert parser.load_all_tasks() is first
+    
+    todo_file.write_text("first task +work\nsecond task +home\n")
+    stat = todo_file.stat()
+    os.utime(todo_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    tasks = parser.load_all_tasks()
+    assert len(tasks) == 2
+    assert tasks[1]['projects'] == ['home']
+
+def test_parse_precomputed_sets(parser):
+    """Test that derived context/project sets are available but not serialized"""
+    task = parser.parse_line("(B) plan sprint +work +planning @focus @deep")
+    
+    assert task.contexts_set == frozenset({'focus', 'deep'})
+    assert task.projects_set == frozenset({'work', 'planning'})
+    assert 'contexts_set' not in json.loads(json.dumps(task))
+
+def test_parse_interns_repeated_names(parser):
+    """Test that project/context names are shared string objects across tasks"""
+    first = parser.parse_line("(A) write report +work @focus")
+    second = parser.parse_line("(A) review notes +work @focus")
+    
+    assert first['projects'][0] is second['projects'][0]
+    assert first['contexts'][0] is second['contexts'][0]
+    assert first['priority'] is second['priority']
+
+def test_parse_interns_dates_and_recurrence(parser):
+    """Test that repeated due dates and recurrences share string objects"""
+    first = parser.parse_line("pay rent due:2024-02-01 rec:+1m")
+    second = parser.parse_line("pay bills due:2024-02-01 rec:+1m")
+    
+    assert first['due_date'] is second['due_date']
+    assert first['recurrence'] is second['recurrence']
+
+def test_parse_date_keys_need_word_boundary(parser):
+    """Test that due:/t: inside other key:value tokens are not picked up"""
+    task = parser.parse_line("renew license overdue:2024-01-05 start:2024-01-01")
+    
+    assert task['due_date'] is None
+    assert task['threshold_date'] is None
+
+def test_parse_projects_without_priority(parser):
+    """Test that projects are extracted whether or not the task has a priority"""
+    assert parser.parse_line("do thing +work")['projects'] == ['work']
+    assert parser.parse_line("(B) do thing +work")['projects'] == ['work']
+    assert parser.parse_line("x 2024-01-15 did thing +work")['projects'] == ['work']
+
+def test_parse_tags_must_start_token(parser):
+    """Test that only tokens starting with +/@ are projects/contexts"""
+    task = parser.parse_line("email bob@example.com about a+b +work, @phone")
+    
+    assert task['projects'] == ['work']
+    assert task['contexts'] == ['phone']
+
+def test_parse_description_drops_metadata_tokens(parser):
+    """Test that metadata is dropped from the description wherever it appears"""
+    task = parser.parse_line("(A) due:2024-01-05 call mom  rec:+1w @phone +family")
+    
+    assert task['description'] == 'call mom @phone +family'
+    assert task['due_date'] == '2024-01-05'
+    assert task['recurrence'] == '+1w'
+
+def test_load_all_tasks_reparses_on_size_change(tmp_path):
+    """Test that a rewrite keeping the same mtime is still picked up"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text("first task\n")
+    stat = todo_file.stat()
+    parser = TodoParser(str(todo_file))
+    assert len(parser.load_all_tasks()) == 1
+    
+    todo_file.write_text("first task\nsecond task\n")
+    os.utime(todo_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    
+    assert len(parser.load_all_tasks()) == 2
+
+def test_load_all_tasks_reuses_unchanged_lines(tmp_path):
+    """Test that a re-parse keeps tasks for unchanged lines and renumbers moved ones"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text("(A) first +work\nsecond @home\n")
+    parser = TodoParser(str(todo_file))
+    first, second = parser.load_all_tasks()
+    
+    todo_file.write_text("(A) first +work\nnew task\nsecond @home\n")
+    tasks = parser.load_all_tasks()
+    
+    assert tasks[0] is first
+    assert tasks[2] == {**second, 'line_number': 3}
+    assert tasks[2].contexts_set == frozenset({'home'})
+    assert second['line_number'] == 2
+    assert [task['line_number'] for task in parser.sort_tasks(tasks)] == [1, 2, 3]
+
+def test_load_all_tasks_missing_file(tmp_path):
+    """Test that a missing todo file yields no tasks"""
+    parser = TodoParser(str(tmp_path / "missing.txt"))
+    
+    assert parser.load_all_tasks() == []
+
+def test_load_all_tasks_keeps_read_error_type(tmp_path):
+    """Test that read errors propagate with their original exception type"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_bytes(b"caf\xe9 task\n")
+    parser = TodoParser(str(todo_file))
+    
+    with pytest.raises(UnicodeDecodeError):
+        parser.load_all_tasks()
@@ -1,14 +1,10 @@
 """
 Test query tool functionality
 """
+import os
 import pytest
 import json
-from pathlib import Path
-from todo_manager import TodoManager
-
-@pytest.fixture
-def sample_todo_file():
-    return str(Path(__file__).parent / "fixtures" / "sample_todo.txt")
+from todo_manager import FILTER_CACHE_SIZE, TodoManager
 
 @pytest.fixture
 def manager(sample_todo_file):
@@ -67,6 +63,18 @@ def test_max_results_limit(manager):
     assert result['results_info']['total_returned'] <= 3
     assert len(result['tasks']) <= 3
 
+def test_max_results_truncation_flag(manager):
+    """Test that truncation is reported only when active tasks were left out"""
+    active_count = manager.query_tasks(max_results=0)['results_info']['total_returned']
+    
+    at_limit = manager.query_tasks(max_results=active_count)
+    below_limit = manager.query_tasks(max_results=active_count - 1)
+    
+    assert at_limit['results_info']['truncated'] is False
+    assert at_limit['results_info']['total_returned'] == active_count
+    assert below_limit['results_info']['truncated'] is True
+    assert below_limit['results_info']['total_returned'] == active_count - 1
+
 def test_include_completed_tasks(manager):
     """Test including completed tasks"""
     result = manager.query_tasks(exclude_completed=False)
@@ -82,4 +90,56 @@ def test_empty_query(manager):
     
     assert result['query_info']['query_text'] == ""
     assert result['results_info']['search_applied'] == False
-    assert result['results_info']['total_returned'] > 0
\ No newline at end of file
+    assert result['results_info']['total_returned'] > 0
+
+def test_filter_results_cached_until_file_changes(tmp_path):
+    """Test that manager filter results are reused until the file is modified"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text("first task +work\n")
+    manager = TodoManager(str(todo_file))
+    
+    first = manager.filter_tasks(include_projects=['work'])
+    assert manager.filter_tasks(include_projects=['work']) is first
+    
+    todo_file.write_text("first task +work\nsecond task +work\n")
+    stat = todo_file.stat()
+    os.utime(todo_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    assert len(manager.filter_tasks(include_projects=['work'])) == 2
+
+def test_filter_cache_is_bounded(manager):
+    """Test that distinct filter results are evicted least recently used first"""
+    first = manager.filter_tasks(max_results=1)
+    second = manager.filter_tasks(max_results=2)
+    for limit in range(3, FILTER_CACHE_SIZE + 1):
+        manager.filter_tasks(max_results=limit)
+    assert manager.filter_tasks(max_results=1) is first
+    
+    manager.filter_tasks(max_results=FILTER_CACHE_SIZE + 1)
+    
+    assert len(manager._filter_cache) == FILTER_CACHE_SIZE
+    assert manager.filter_tasks(max_results=1) is first
+    assert manager.filter_tasks(max_results=2) is not second
+
+def test_query_matches_description_and_raw_text(tmp_path):
+    """Test case-insensitive search over cleaned description and raw line"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text("call mom due:2024-01-01 tonight +Family @Phone\n")
+    manager = TodoManager(str(todo_file))
+    
+    # Only matches the description, where due: has been removed
+    assert manager.query_tasks(query_text="MOM TONIGHT")['results_info']['total_returned'] == 1
+    # Only matches the raw line (project/context names)
+    assert manager.query_tasks(query_text="famil")['results_info']['total_returned'] == 1
+    assert manager.query_tasks(query_text="phone")['results_info']['total_returned'] == 1
+    assert manager.query_tasks(query_text="dad")['results_info']['total_returned'] == 0
+
+def test_overview_priority_distribution_order(tmp_path):
+    """Test that priorities are listed A-Z with 'No Priority' last"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text("(Z) last\nno priority\n(P) middle\n(A) first\n")
+    manager = TodoManager(str(todo_file))
+    
+    distribution = manager.get_overview()['priority_distribution']
+    
+    assert list(distribution) == ['A', 'P', 'Z', 'No Priority']
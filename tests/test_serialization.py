@@ -0,0 +1,44 @@
+"""
+Test JSON serialization of tool responses
+"""
+import pytest
+import json
+import serialization
+from serialization import dumps, dumps_tasks_response
+from todo_parser import TodoParser
+
+@pytest.fixture
+def tasks(sample_todo_file):
+    return TodoParser(sample_todo_file).load_all_tasks()
+
+def test_dumps_non_ascii():
+    """Test that non-ASCII text is kept as-is"""
+    text = dumps({'description': 'zavolat doktorovi +zdraví'})
+    
+    assert 'zdraví' in text
+    assert json.loads(text) == {'description': 'zavolat doktorovi +zdraví'}
+
+def test_tasks_response_matches_full_dump(tasks):
+    """Test that the fragment-built response equals serializing the whole dict"""
+    metadata = {'total_returned': len(tasks), 'summary': {'message': 'ok'}}
+    
+    text = dumps_tasks_response(tasks, metadata)
+    
+    assert json.loads(text) == json.loads(dumps({'tasks': tasks, 'metadata': metadata}))
+
+def test_tasks_response_empty():
+    """Test fragment-built response with no tasks"""
+    text = dumps_tasks_response([], {'total_returned': 0})
+    
+    assert json.loads(text) == {'tasks': [], 'metadata': {'total_returned': 0}}
+
+def test_task_encoding_memoized(tasks, monkeypatch):
+    """Test that each task is encoded once and then reused"""
+    # Pretty output (TODO_MCP_PRETTY_JSON) serializes the whole response instead
+    monkeypatch.setattr(serialization, "PRETTY_JSON", False)
+    dumps_tasks_response(tasks, {})
+    encoded = [task.encoded for task in tasks]
+    
+    assert all(encoded)
+    dumps_tasks_response(tasks, {})
+    assert all(task.encoded is e for task, e in zip(tasks, encoded))
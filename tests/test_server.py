@@ -1,185 +1,185 @@
 """
 Test MCP server functionality - corrected version
 """
+import asyncio
 import pytest
-import json
-from pathlib import Path
-from server import server, init_todo_manager
+import os
+import sys
+from tests.helpers import gate_warm_up, loads, response_data, stub_stdio
+import server as server_module
+from server import server, init_todo_manager, handle_call_tool, handle_list_tools
 
-@pytest.fixture
-def sample_todo_file():
-    return str(Path(__file__).parent / "fixtures" / "sample_todo.txt") 
+EXPECTED_TOOLS = frozenset({
+    "get_task_overview",
+    "suggest_next_task",
+    "show_project_tasks",
+    "show_waiting_tasks",
+    "show_inbox_tasks",
+    "show_context_tasks",
+    "query_tasks",
+})
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def initialized_server(sample_todo_file):
-    """Initialize server with test data"""
+    """Initialize server with test data, once for all read-only tests"""
     init_todo_manager(sample_todo_file)
     return server
 
-@pytest.mark.asyncio
+@pytest.fixture(scope="session")
+def call_tool_cached(initialized_server):
+    """Call a tool and decode its response, once per (tool, arguments) for the session.
+
+    The todo data does not change between read-only tests, so neither do the
+    responses. Returned data is shared and must not be modified.
+    """
+    responses = {}
+    
+    async def call(name, arguments):
+        key = (name, repr(sorted(arguments.items())))
+        if key not in responses:
+            responses[key] = response_data(await handle_call_tool(name, arguments))
+        return responses[key]
+    
+    return call
+
+@pytest.fixture
+def reinitialized_server(initialized_server, sample_todo_file):
+    """For tests that re-initialize the server; restores the shared setup afterwards"""
+    yield initialized_server
+    init_todo_manager(sample_todo_file)
+
 async def test_list_tools(initialized_server):
     """Test that all expected tools are listed"""
-    # Call the handler function directly
-    from server import handle_list_tools
-    
     tools = await handle_list_tools()
     
     tool_names = [tool.name for tool in tools]
-    expected_tools = [
-        "get_task_overview",
-        "suggest_next_task", 
-        "show_project_tasks",
-        "show_waiting_tasks",
-        "show_inbox_tasks",
-        "show_context_tasks",
-        "query_tasks"
-    ]
-    
-    for expected in expected_tools:
-        assert expected in tool_names
+    assert EXPECTED_TOOLS <= set(tool_names)
     
     # Verify we have the right number of tools
-    assert len(tools) == len(expected_tools)
+    assert len(tools) == len(EXPECTED_TOOLS)
 
 
-@pytest.mark.asyncio
-async def test_get_task_overview(initialized_server):
-    """Test task overview tool"""
-    # Import and call the handler directly
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("get_task_overview", {})
-    
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
-    assert 'total_tasks' in data
-    assert 'active_tasks' in data
-    assert 'priority_distribution' in data
-    assert data['total_tasks'] > 0
+# (tool, arguments, keys the response must have, exact values expected in it)
+TOOL_CASES = [
+    ("get_task_overview", {}, {"total_tasks", "active_tasks", "priority_distribution"},
+     {"total_tasks": 17, "inbox_tasks": 2}),
+    ("suggest_next_task", {}, {"suggested_task", "reasoning", "alternatives"}, {}),
+    ("show_project_tasks", {"project_name": "work"}, {"active_tasks", "waiting_tasks"},
+     {"project": "work"}),
+    ("show_inbox_tasks", {}, {"inbox_tasks", "count"}, {"count": 2}),
+    ("show_waiting_tasks", {}, {"waiting_tasks", "by_project"}, {}),
+    ("show_context_tasks", {"context": "offline"}, {"tasks", "count"}, {"context": "offline"}),
+]
 
-@pytest.mark.asyncio
-async def test_suggest_next_task(initialized_server):
-    """Test task suggestion"""
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("suggest_next_task", {})
-    
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
-    assert 'suggested_task' in data
-    assert 'reasoning' in data
-    assert 'alternatives' in data
+@pytest.mark.parametrize("tool,args,keys,values", TOOL_CASES, ids=[case[0] for case in TOOL_CASES])
+async def test_tool_response(call_tool_cached, tool, args, keys, values):
+    """Test each tool's response shape and known values from the sample data"""
+    data = await call_tool_cached(tool, args)
+    
+    assert keys <= data.keys()
+    for key, value in values.items():
+        assert data[key] == value
+
+async def test_all_tools_concurrently(reinitialized_server, sample_todo_file):
+    """Test that concurrent tool calls on a cold server each get the right response"""
+    init_todo_manager(sample_todo_file)
+    results = await asyncio.gather(*(handle_call_tool(tool, args) for tool, args, _, _ in TOOL_CASES))
+    
+    for (tool, args, keys, values), result in zip(TOOL_CASES, results):
+        assert len(result) == 1
+        data = loads(result[0].text)
+        assert keys <= data.keys(), tool
+        for key, value in values.items():
+            assert data[key] == value
 
-@pytest.mark.asyncio  
 async def test_suggest_next_task_with_time(initialized_server):
     """Test task suggestion with time constraint"""
-    from server import handle_call_tool
-    
     result = await handle_call_tool("suggest_next_task", {
         "time_available_minutes": 30
     })
     
+    # Only a phrase is checked, so match the raw response text without decoding it
     assert len(result) == 1
-    data = json.loads(result[0].text)
-    
-    assert 'You have 30 minutes available' in data['reasoning']
-
-@pytest.mark.asyncio
-async def test_show_project_tasks(initialized_server):
-    """Test showing tasks for specific project"""
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("show_project_tasks", {
-        "project_name": "work"
-    })
-    
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
-    assert data['project'] == 'work'
-    assert 'active_tasks' in data
-    assert 'waiting_tasks' in data
-
-@pytest.mark.asyncio
-async def test_show_inbox_tasks(initialized_server):
-    """Test showing inbox tasks"""
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("show_inbox_tasks", {})
-    
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
-    assert 'inbox_tasks' in data
-    assert 'count' in data
-    assert data['count'] == 2  # Based on sample data
-
-@pytest.mark.asyncio
-async def test_show_waiting_tasks(initialized_server):
-    """Test showing waiting tasks"""
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("show_waiting_tasks", {})
-    
-    assert len(result) == 1  
-    data = json.loads(result[0].text)
-    
-    assert 'waiting_tasks' in data
-    assert 'by_project' in data
-
-@pytest.mark.asyncio
-async def test_show_context_tasks(initialized_server):
-    """Test showing tasks by context"""
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("show_context_tasks", {
-        "context": "offline"
-    })
-    
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
-    assert data['context'] == 'offline'
-    assert 'tasks' in data
-    assert 'count' in data
+    assert 'You have 30 minutes available' in result[0].text
 
-@pytest.mark.asyncio
 async def test_invalid_tool_name(initialized_server):
     """Test calling non-existent tool"""
-    from server import handle_call_tool
-    
     result = await handle_call_tool("invalid_tool", {})
     
     assert len(result) == 1
     assert "Unknown tool" in result[0].text
 
-@pytest.mark.asyncio  
-async def test_missing_required_argument(initialized_server):
+@pytest.mark.parametrize("tool,argument", [
+    ("show_project_tasks", "project_name"),
+    ("show_context_tasks", "context"),
+])
+async def test_missing_required_argument(initialized_server, tool, argument):
     """Test calling tool without required argument"""
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("show_project_tasks", {})
+    result = await handle_call_tool(tool, {})
     
+    assert len(result) == 1
+    assert result[0].text == f"Error: Missing required argument(s) for {tool}: {argument}"
+
 
-@pytest.mark.asyncio
-async def test_query_tasks(initialized_server):
+async def test_query_tasks(call_tool_cached):
     """Test generic query tasks tool"""
-    from server import handle_call_tool
-    
-    result = await handle_call_tool("query_tasks", {
+    data = await call_tool_cached("query_tasks", {
         "query_text": "review",
         "projects": ["work"],
         "max_results": 10
     })
     
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
     assert 'tasks' in data
     assert 'query_info' in data
     assert 'results_info' in data
     assert data['query_info']['query_text'] == "review"
     assert data['query_info']['projects_filter'] == ["work"]
     assert data['results_info']['total_returned'] <= 10
+
+async def test_query_tasks_null_arguments_use_defaults(call_tool_cached):
+    """Test that null query_tasks arguments behave like omitted ones"""
+    data = await call_tool_cached("query_tasks", {
+        "query_text": None,
+        "projects": None,
+        "contexts": None,
+        "exclude_completed": None,
+        "max_results": None
+    })
+    
+    assert data == await call_tool_cached("query_tasks", {})
+    assert data['query_info']['exclude_completed'] is True
+    assert data['query_info']['max_results'] == 1000
+
+async def test_response_cache_invalidated_on_file_change(reinitialized_server, tmp_path):
+    """Test that cached responses are refreshed when the todo file changes"""
+    todo_file = tmp_path / "todo.txt"
+    todo_file.write_text("first inbox item +in\n")
+    init_todo_manager(str(todo_file))
+    
+    result = await handle_call_tool("show_inbox_tasks", {})
+    assert loads(result[0].text)['count'] == 1
+    
+    todo_file.write_text("first inbox item +in\nsecond inbox item +in\n")
+    stat = todo_file.stat()
+    os.utime(todo_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    result = await handle_call_tool("show_inbox_tasks", {})
+    assert loads(result[0].text)['count'] == 2
+
+async def test_main_warmup_awaited_by_first_call(reinitialized_server, sample_todo_file, monkeypatch):
+    """Test that main() starts the warm-up and the first tool call waits for it"""
+    release = gate_warm_up(monkeypatch)
+    stub_stdio(monkeypatch, server)
+    monkeypatch.setattr(sys, "argv", ["server.py", sample_todo_file])
+    
+    await server_module.main()
+    call = asyncio.create_task(handle_call_tool("get_task_overview", {}))
+    try:
+        await asyncio.sleep(0.05)
+        assert not call.done()
+    finally:
+        release.set()
+    result = await call
+    
+    assert server_module._warmup.done()
+    assert loads(result[0].text)["inbox_tasks"] == 2
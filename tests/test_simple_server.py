@@ -1,40 +1,58 @@
 """
 Test simple MCP server functionality
 """
+import asyncio
+import sys
 import pytest
-import json
-from pathlib import Path
-from simple_server import simple_server, init_todo_manager
+from tests.helpers import gate_warm_up, loads, response_data, stub_stdio
+import simple_server as simple_server_module
+from simple_server import simple_server, init_todo_manager, handle_call_tool, handle_list_tools
 
-@pytest.fixture
-def sample_todo_file():
-    return str(Path(__file__).parent / "fixtures" / "sample_todo.txt") 
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def initialized_simple_server(sample_todo_file):
-    """Initialize simple server with test data"""
+    """Initialize simple server with test data, once for all tests"""
     init_todo_manager(sample_todo_file)
     return simple_server
 
-@pytest.mark.asyncio
-async def test_list_tools_simple(initialized_simple_server):
+@pytest.fixture(scope="module")
+def run_async():
+    """Run a coroutine on one event loop shared by this module's synchronous tests.
+
+    Each test makes a single handler call, so plain sync tests driving a
+    shared loop avoid per-test event loop setup.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
+
+@pytest.fixture(scope="module")
+def call_tool_cached(initialized_simple_server, run_async):
+    """Call a tool and decode its response, once per (tool, arguments) for the module.
+
+    The todo data does not change between tests, so neither do the responses.
+    Returned data is shared and must not be modified.
+    """
+    responses = {}
+    
+    def call(name, arguments):
+        key = (name, repr(sorted(arguments.items())))
+        if key not in responses:
+            responses[key] = response_data(run_async(handle_call_tool(name, arguments)))
+        return responses[key]
+    
+    return call
+
+def test_list_tools_simple(initialized_simple_server, run_async):
     """Test that the simple server has only one tool"""
-    from src.simple_server import handle_list_tools
-    
-    tools = await handle_list_tools()
+    tools = run_async(handle_list_tools())
     
     assert len(tools) == 1
     assert tools[0].name == "get_all_tasks"
 
-@pytest.mark.asyncio
-async def test_get_all_tasks_default(initialized_simple_server):
+def test_get_all_tasks_default(call_tool_cached):
     """Test getting all tasks with default parameters"""
-    from simple_server import handle_call_tool
-    
-    result = await handle_call_tool("get_all_tasks", {})
-    
-    assert len(result) == 1
-    data = json.loads(result[0].text)
+    data = call_tool_cached("get_all_tasks", {})
     
     assert 'tasks' in data
     assert 'metadata' in data
@@ -44,94 +62,58 @@ async def test_get_all_tasks_default(initialized_simple_server):
     for task in data['tasks']:
         assert not task['completed']
 
-@pytest.mark.asyncio
-async def test_get_all_tasks_include_completed(initialized_simple_server):
+def test_get_all_tasks_include_completed(call_tool_cached):
     """Test getting all tasks including completed ones"""
-    from simple_server import handle_call_tool
-    
-    result = await handle_call_tool("get_all_tasks", {
+    data = call_tool_cached("get_all_tasks", {
         "include_completed": True
     })
     
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
     # Should have at least one completed task based on sample data
     completed_tasks = [t for t in data['tasks'] if t['completed']]
     assert len(completed_tasks) >= 1
 
-@pytest.mark.asyncio
-async def test_get_all_tasks_filter_by_project(initialized_simple_server):
+def test_get_all_tasks_filter_by_project(call_tool_cached):
     """Test filtering tasks by project"""
-    from simple_server import handle_call_tool
-    
-    result = await handle_call_tool("get_all_tasks", {
+    data = call_tool_cached("get_all_tasks", {
         "include_projects": ["work"]
     })
     
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
     # All returned tasks should have 'work' project
     for task in data['tasks']:
         assert 'work' in task['projects']
 
-@pytest.mark.asyncio
-async def test_get_all_tasks_exclude_waiting(initialized_simple_server):
+def test_get_all_tasks_exclude_waiting(call_tool_cached):
     """Test excluding waiting tasks"""
-    from simple_server import handle_call_tool
-    
-    result = await handle_call_tool("get_all_tasks", {
+    data = call_tool_cached("get_all_tasks", {
         "exclude_contexts": ["waiting"]
     })
     
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
     # No tasks should have 'waiting' context
     for task in data['tasks']:
         assert 'waiting' not in task['contexts']
 
-@pytest.mark.asyncio
-async def test_get_all_tasks_max_results(initialized_simple_server):
+def test_get_all_tasks_max_results(call_tool_cached):
     """Test limiting results"""
-    from simple_server import handle_call_tool
-    
-    result = await handle_call_tool("get_all_tasks", {
+    data = call_tool_cached("get_all_tasks", {
         "max_results": 3
     })
     
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
     assert data['metadata']['total_returned'] <= 3
     assert len(data['tasks']) <= 3
 
-@pytest.mark.asyncio
-async def test_get_all_tasks_with_due_dates_only(initialized_simple_server):
+def test_get_all_tasks_with_due_dates_only(call_tool_cached):
     """Test filtering for tasks with due dates only"""
-    from simple_server import handle_call_tool
-    
-    result = await handle_call_tool("get_all_tasks", {
+    data = call_tool_cached("get_all_tasks", {
         "has_due_date": True
     })
     
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    
     # All returned tasks should have due dates
     for task in data['tasks']:
         assert task['due_date'] is not None
 
-@pytest.mark.asyncio
-async def test_metadata_summary(initialized_simple_server):
+def test_metadata_summary(call_tool_cached):
     """Test that metadata summary is comprehensive"""
-    from simple_server import handle_call_tool
-    
-    result = await handle_call_tool("get_all_tasks", {})
-    
-    assert len(result) == 1
-    data = json.loads(result[0].text)
+    data = call_tool_cached("get_all_tasks", {"include_summary": True})
     
     summary = data['metadata']['summary']
     assert 'task_count' in summary
@@ -139,3 +121,32 @@ async def test_metadata_summary(initialized_simple_server):
     assert 'top_projects' in summary
     assert 'contexts' in summary
     assert 'due_date_info' in summary
+
+def test_metadata_summary_opt_in(initialized_simple_server, run_async):
+    """Test that the summary is left out unless requested"""
+    result = run_async(handle_call_tool("get_all_tasks", {}))
+    
+    data = loads(result[0].text)
+    assert 'summary' not in data['metadata']
+    assert data['metadata']['total_returned'] == len(data['tasks'])
+
+def test_main_warmup_awaited_by_first_call(initialized_simple_server, sample_todo_file, run_async, monkeypatch):
+    """Test that main() starts the warm-up and the first tool call waits for it"""
+    release = gate_warm_up(monkeypatch)
+    stub_stdio(monkeypatch, simple_server)
+    monkeypatch.setattr(sys, "argv", ["simple_server.py", sample_todo_file])
+    
+    async def start_then_call():
+        await simple_server_module.main()
+        call = asyncio.create_task(handle_call_tool("get_all_tasks", {}))
+        try:
+            await asyncio.sleep(0.05)
+            assert not call.done()
+        finally:
+            release.set()
+        return await call
+    
+    result = run_async(start_then_call())
+    
+    assert simple_server_module._warmup.done()
+    assert loads(result[0].text)['tasks']